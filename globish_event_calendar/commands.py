@@ -0,0 +1,74 @@
+import json
+
+import click
+import frappe
+from frappe.commands import get_site, pass_context
+
+
+@click.command("calendar-load-test-seed")
+@click.option("--users", default=20, help="Number of synthetic users")
+@click.option("--events", default=2000, help="Number of Events")
+@click.option("--views", default=3, help="Number of Event Calendar Views")
+@click.option("--private-ratio", default=0.3, help="Share of Private Events")
+@click.option("--recurring-ratio", default=0.2, help="Share of repeating Events")
+@click.option("--share-ratio", default=0.1, help="Share of Private Events shared with another user")
+@click.option("--random-seed", default=0, help="Seed for a reproducible dataset")
+@click.option("--clear", is_flag=True, help="Only delete the load-test data")
+@pass_context
+def calendar_load_test_seed(
+    context, users, events, views, private_ratio, recurring_ratio, share_ratio, random_seed, clear
+):
+    "Seed the site with synthetic calendar data for calendar-load-test"
+    from globish_event_calendar.load_test import clear_dataset, seed_dataset
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        if clear:
+            clear_dataset()
+        else:
+            seed_dataset(users, events, views, private_ratio, recurring_ratio, share_ratio, random_seed)
+    finally:
+        frappe.destroy()
+
+
+@click.command("calendar-load-test")
+@click.option("--url", default="http://127.0.0.1:8000", help="Base URL of the running bench")
+@click.option("--duration", default=60, help="Seconds of concurrent traffic")
+@click.option("--concurrency", default=16, help="Number of concurrent clients")
+@click.option("--mix", help='Request mix as JSON, e.g. {"event.get_events": 50, "calendar.update_event": 10}')
+@click.option(
+    "--calibration-requests",
+    default=20,
+    help="Serial requests per endpoint used to count database queries (0 to skip)",
+)
+@click.option("--random-seed", default=0, help="Seed for a reproducible request sequence")
+@click.option("--output", help="Also write the report as JSON to this file")
+@pass_context
+def calendar_load_test(context, url, duration, concurrency, mix, calibration_requests, random_seed, output):
+    "Replay calendar traffic against a running bench and report throughput, latency and query counts"
+    from globish_event_calendar.load_test import format_report, run_load_test
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        report = run_load_test(
+            url,
+            duration=duration,
+            concurrency=concurrency,
+            mix=json.loads(mix) if mix else None,
+            calibration_requests=calibration_requests,
+            random_seed=random_seed,
+        )
+    finally:
+        frappe.destroy()
+
+    click.echo(format_report(report))
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=1)
+
+
+commands = [calendar_load_test_seed, calendar_load_test]
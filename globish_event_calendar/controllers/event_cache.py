@@ -0,0 +1,237 @@
+# This module keeps the expanded results of custom_get_events in two in-process LRU layers, so users
+# no longer run the query and the recurrence expansion separately for the same Public events.
+# The shared layer holds the Public occurrences of a window; the per-user overlay holds the user's own
+# non-Public events and the events shared with them. custom_get_events merges both at request time.
+# Entries are keyed by generation tokens kept in Redis. Public one-off events are tracked per calendar
+# month and Public series under a token of their own, so a change only drops the windows it can show up
+# in. The Event and DocShare hooks drop the affected tokens once the change is committed, so every worker
+# stops serving exactly those entries. Writes that bypass the hooks are covered by the hooks below where
+# they can be seen, and by a TTL on every entry where they cannot.
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+import frappe
+from frappe.utils import cint, getdate
+
+CACHE_SETTING = "calendar_event_cache"
+DEFAULT_SIZES = {"public": 128, "user": 1024}
+DEFAULT_TTL = 300  # seconds
+
+# results read from a lagging replica may predate the invalidation that made room for them,
+# so they are only kept for a short while
+REPLICA_ENTRY_TTL = 30  # seconds
+
+# windows spanning more months than this are tracked by a single token that every Public change drops
+MAX_MONTH_BUCKETS = 12
+
+GENERATION_KEY = "calendar_event_cache::{scope}"
+STATS_KEY = "calendar_event_cache::stats"
+PARTICIPANT_DOCTYPES_KEY = "calendar_event_cache::participant_doctypes"
+
+_layers: dict[str, "LRUCache"] = {}
+
+
+class LRUCache:
+    """A small thread-safe LRU mapping whose entries expire after a TTL."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value, expires_at = self.entries.get(key, (None, None))
+            if value is None or expires_at < time.monotonic():
+                self.entries.pop(key, None)
+                return None
+
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: int):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {"size": len(self.entries), "maxsize": self.maxsize}
+
+
+def get_settings() -> dict:
+    return frappe.conf.get(CACHE_SETTING) or {}
+
+
+def is_enabled() -> bool:
+    return bool(cint(get_settings().get("enabled", 1)))
+
+
+def get_ttl() -> int:
+    ttl = cint(get_settings().get("ttl")) or DEFAULT_TTL
+    return min(ttl, REPLICA_ENTRY_TTL) if frappe.flags.read_only else ttl
+
+
+def get_layer(name: str) -> LRUCache:
+    if name not in _layers:
+        _layers[name] = LRUCache(cint(get_settings().get(f"{name}_size")) or DEFAULT_SIZES[name])
+
+    return _layers[name]
+
+
+def get_public_events(window: tuple, build) -> list[frappe._dict]:
+    """Public occurrences for `window` (start, end, filters), expanded by `build()` on a miss."""
+    months = get_months(window[0], window[1])
+    scopes = ["all", "public", "public::recurring"]
+    if months:
+        scopes.extend(f"public::{month}" for month in months)
+    else:
+        scopes.append("public::long")
+
+    return get_or_build("public", (frappe.local.site, *get_generations(scopes), *window), build)
+
+
+def get_user_events(user: str, window: tuple, build) -> list[frappe._dict]:
+    """The user's own and shared non-Public occurrences for `window`, expanded by `build()` on a miss."""
+    key = (frappe.local.site, user, *get_generations(["all", f"user::{user}"]), *window)
+    return get_or_build("user", key, build)
+
+
+def get_or_build(layer_name: str, key: tuple, build):
+    layer = get_layer(layer_name)
+    events = layer.get(key)
+    counter = f"{layer_name}_misses" if events is None else f"{layer_name}_hits"
+    frappe.cache.hincrby(frappe.cache.make_key(STATS_KEY), counter)
+    if events is None:
+        events = build()
+        layer.set(key, events, ttl=get_ttl())
+
+    return events
+
+
+def get_months(start, end) -> list[str] | None:
+    """The calendar months from `start` to `end` as "YYYY-MM", or None if there are too many."""
+    start, end = getdate(start), getdate(end or start)
+    count = (end.year - start.year) * 12 + end.month - start.month + 1
+    if count > MAX_MONTH_BUCKETS:
+        return None
+
+    return [
+        f"{start.year + (start.month - 1 + offset) // 12}-{(start.month - 1 + offset) % 12 + 1:02d}"
+        for offset in range(max(count, 1))
+    ]
+
+
+def get_generations(scopes: list[str]) -> list[bytes]:
+    """Current generation token of each scope, fetched in one round trip and created where missing."""
+    keys = [frappe.cache.make_key(GENERATION_KEY.format(scope=scope)) for scope in scopes]
+    generations = frappe.cache.mget(keys)
+    for i, generation in enumerate(generations):
+        if generation is None:
+            generation = frappe.generate_hash(length=10).encode()
+            # keep the token if another worker created one in the meantime
+            if not frappe.cache.set(keys[i], generation, nx=True):
+                generation = frappe.cache.get(keys[i])
+            generations[i] = generation
+
+    return generations
+
+
+def clear_layers(scopes=()):
+    """Drop the generation tokens of `scopes` so every worker rebuilds the entries keyed by them."""
+    if scopes:
+        keys = [frappe.cache.make_key(GENERATION_KEY.format(scope=scope)) for scope in set(scopes)]
+        frappe.cache.delete(*keys)
+
+
+def clear_layers_after_commit(scopes):
+    # clearing before the commit would let a concurrent request cache the old rows under a fresh token
+    frappe.db.after_commit.add(functools.partial(clear_layers, tuple(scopes)))
+
+
+def get_public_scopes(event) -> list[str]:
+    """The tokens of the Public windows `event` can show up in."""
+    if event.get("repeat_this_event"):
+        return ["public::recurring"]
+
+    months = get_months(event.get("starts_on"), event.get("ends_on"))
+    if not months:
+        return ["public"]
+
+    return ["public::long", *(f"public::{month}" for month in months)]
+
+
+def clear_event(event, previous=None):
+    """Invalidate the layers that can contain `event` or its `previous` version.
+
+    Both are mappings with the Event's `name`, `event_type`, `owner`, `starts_on`, `ends_on`
+    and `repeat_this_event`.
+    """
+    versions = [version for version in (event, previous) if version]
+    scopes = []
+    for version in versions:
+        if version.get("event_type") == "Public":
+            scopes.extend(get_public_scopes(version))
+
+    if any(version.get("event_type") != "Public" for version in versions):
+        scopes.append(f"user::{event.get('owner')}")
+        scopes.extend(
+            f"user::{user}"
+            for user in frappe.get_all(
+                "DocShare", filters={"share_doctype": "Event", "share_name": event.get("name")}, pluck="user"
+            )
+        )
+
+    clear_layers_after_commit(scopes)
+
+
+def on_event_change(doc, method=None):
+    clear_event(doc, doc.get_doc_before_save() if method == "on_update" else None)
+
+    participant_doctypes = {participant.reference_doctype for participant in doc.get("event_participants")}
+    if participant_doctypes - get_participant_doctypes():
+        frappe.db.after_commit.add(functools.partial(frappe.cache.delete_value, PARTICIPANT_DOCTYPES_KEY))
+
+
+def on_share_change(doc, method=None):
+    if doc.share_doctype == "Event":
+        clear_layers_after_commit([f"user::{doc.user}"])
+
+
+def on_document_trash(doc, method=None):
+    # frappe's delete_events drops the Events of a deleted participant with frappe.db.delete,
+    # which runs no Event hooks, so any deleted participant clears the whole cache
+    if doc.doctype not in ("Event", "DocShare") and doc.doctype in get_participant_doctypes():
+        clear_layers_after_commit(["all"])
+
+
+def get_participant_doctypes() -> set[str]:
+    return set(
+        frappe.cache.get_value(
+            PARTICIPANT_DOCTYPES_KEY,
+            generator=lambda: frappe.get_all("Event Participants", distinct=True, pluck="reference_doctype"),
+        )
+    )
+
+
+@frappe.whitelist()
+def get_cache_stats() -> dict:
+    """Hit-rate counters of both layers across the site, with the entry counts of the serving worker."""
+    frappe.only_for("System Manager")
+    stats = {}
+    for name in DEFAULT_SIZES:
+        hits, misses = map(
+            cint, frappe.cache.hmget(frappe.cache.make_key(STATS_KEY), [f"{name}_hits", f"{name}_misses"])
+        )
+        stats[name] = {
+            **get_layer(name).stats(),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+    return stats
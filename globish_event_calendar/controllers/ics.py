@@ -0,0 +1,482 @@
+# This module serves Events as an iCalendar (RFC 5545) feed for external calendar clients.
+# A feed belongs to a user and optionally an Event "Calendar View", whose filters narrow it down. Each such pair
+# has its own token, issued by generate_calendar_feed_token and stored hashed as a "Calendar Feed Token", so
+# renewing the link of one view leaves the user's other feeds working. Repeating events are written once with an RRULE so
+# the client expands them instead of the server. The body is produced by a generator and spooled to a
+# temporary file, keeping memory bounded for large calendars. An ETag lets polling clients revalidate at the
+# cost of two aggregate queries; it also changes when Events are deleted or unshared, which a Last-Modified
+# date would miss, so conditional requests are only answered from it and Last-Modified is informational.
+
+import calendar
+import functools
+import hashlib
+from collections.abc import Iterable, Iterator
+from datetime import datetime, time, timedelta
+from tempfile import SpooledTemporaryFile
+from urllib.parse import quote
+from zoneinfo import ZoneInfo
+
+import frappe
+from frappe import _
+from frappe.desk.reportview import get_filters_cond
+from frappe.utils import (
+    add_days,
+    cint,
+    get_datetime,
+    get_system_timezone,
+    get_url,
+    get_url_to_form,
+    getdate,
+    nowdate,
+    strip_html,
+)
+from werkzeug.http import http_date
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import wrap_file
+
+from globish_event_calendar.controllers.override import (
+    get_calendar_view_filters,
+    visibility_conditions,
+    weekdays,
+)
+
+TOKEN_DOCTYPE = "Calendar Feed Token"
+FEED_METHOD = "globish_event_calendar.controllers.ics.get_calendar_feed"
+DEFAULT_PAST_DAYS = 90
+SPOOL_MAX_SIZE = 1024 * 1024  # bytes kept in memory before the feed spills to disk
+
+ical_weekdays = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+rrule_frequencies = {
+    "Daily": ("DAILY", 1),
+    "Weekly": ("WEEKLY", 1),
+    "Monthly": ("MONTHLY", 1),
+    "Quarterly": ("MONTHLY", 3),
+    "Half Yearly": ("MONTHLY", 6),
+    "Yearly": ("YEARLY", 1),
+}
+
+
+@frappe.whitelist(methods=["POST"])
+def generate_calendar_feed_token(calendar_view: str | None = None) -> str:
+    """Issue a new feed token for the session user and `calendar_view` and return the feed URL.
+
+    The previous token of the same view is revoked; the user's feeds of other views keep working.
+    """
+    if frappe.session.user == "Guest":
+        frappe.throw(_("Log in to create a calendar feed"), frappe.PermissionError)
+
+    if calendar_view:
+        # fails early for views that are missing or do not show Events
+        get_feed_filters(calendar_view)
+
+    revoked = frappe.get_all(
+        TOKEN_DOCTYPE,
+        filters={"user": frappe.session.user, "calendar_view": calendar_view or ("is", "not set")},
+        pluck="name",
+    )
+    if revoked:
+        frappe.db.delete(TOKEN_DOCTYPE, {"name": ("in", revoked)})
+
+    token = frappe.generate_hash(length=32)
+    frappe.get_doc(
+        {
+            "doctype": TOKEN_DOCTYPE,
+            "user": frappe.session.user,
+            "calendar_view": calendar_view,
+            "token_hash": hash_token(token),
+        }
+    ).insert(ignore_permissions=True)
+
+    url = f"/api/method/{FEED_METHOD}?token={token}"
+    if calendar_view:
+        url += f"&calendar_view={quote(calendar_view)}"
+
+    return get_url(url)
+
+
+@frappe.whitelist(allow_guest=True, methods=["GET"])
+def get_calendar_feed(token: str, calendar_view: str | None = None):
+    """iCalendar feed of the Events visible to the token's user, optionally limited to a Calendar View."""
+    user = get_feed_user(token, calendar_view)
+
+    # the request runs as Guest, visibility is limited to `user` by the conditions below
+    filter_condition = get_filters_cond("Event", get_feed_filters(calendar_view), [], ignore_permissions=True)
+    tables = ["`tabEvent`"]
+    if "`tabEvent Participants`" in filter_condition:
+        tables.append("`tabEvent Participants`")
+
+    values = {
+        "user": user,
+        "cutoff": add_days(nowdate(), -cint(frappe.conf.get("calendar_feed_past_days") or DEFAULT_PAST_DAYS)),
+    }
+    conditions = f"""{feed_window_condition}
+        {filter_condition}
+        AND {visibility_conditions["all"]}"""
+
+    etag, last_modified = get_feed_validators(tables, conditions, values, calendar_view)
+    headers = {
+        "ETag": f'"{etag}"',
+        "Cache-Control": "private, no-cache",
+    }
+    if last_modified:
+        headers["Last-Modified"] = http_date(last_modified)
+
+    if frappe.request.if_none_match.contains(etag):
+        return Response(status=304, headers=headers)
+
+    spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    with frappe.db.unbuffered_cursor():
+        events = frappe.db.sql(
+            f"""
+            SELECT DISTINCT `tabEvent`.name,
+                `tabEvent`.subject,
+                `tabEvent`.description,
+                `tabEvent`.starts_on,
+                `tabEvent`.ends_on,
+                `tabEvent`.all_day,
+                `tabEvent`.status,
+                `tabEvent`.repeat_this_event,
+                `tabEvent`.repeat_on,
+                `tabEvent`.repeat_till,
+                `tabEvent`.monday,
+                `tabEvent`.tuesday,
+                `tabEvent`.wednesday,
+                `tabEvent`.thursday,
+                `tabEvent`.friday,
+                `tabEvent`.saturday,
+                `tabEvent`.sunday,
+                `tabEvent`.modified
+            FROM {", ".join(tables)}
+            WHERE {conditions}""",
+            values,
+            as_dict=True,
+            as_iterator=True,
+        )
+        spool.writelines(iter_calendar(events, calendar_view or _("Events")))
+
+    spool.seek(0)
+    headers["Content-Disposition"] = 'inline; filename="calendar.ics"'
+    return Response(
+        wrap_file(frappe.request.environ, spool),
+        mimetype="text/calendar",
+        headers=headers,
+        direct_passthrough=True,
+    )
+
+
+# one-off events that ended within the look-back period, and series that have not finished before it
+feed_window_condition = """(
+            (
+                `tabEvent`.repeat_this_event=0
+                AND date(coalesce(`tabEvent`.ends_on, `tabEvent`.starts_on)) >= %(cutoff)s
+            )
+            OR (
+                `tabEvent`.repeat_this_event=1
+                AND coalesce(`tabEvent`.repeat_till, '3000-01-01') >= %(cutoff)s
+            )
+        )"""
+
+
+def get_feed_user(token: str, calendar_view: str | None) -> str:
+    """The enabled user `token` was issued to for `calendar_view`."""
+    feed = (
+        frappe.db.get_value(
+            TOKEN_DOCTYPE, {"token_hash": hash_token(token)}, ["user", "calendar_view"], as_dict=True
+        )
+        if token
+        else None
+    )
+    # a token only opens the feed of the view it was issued for
+    if (
+        not feed
+        or (feed.calendar_view or None) != (calendar_view or None)
+        or not frappe.db.get_value("User", feed.user, "enabled")
+    ):
+        frappe.throw(_("Invalid calendar feed token"), frappe.AuthenticationError)
+
+    return feed.user
+
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def get_feed_filters(calendar_view: str | None) -> list:
+    if not calendar_view:
+        return []
+
+    calendar_view_doc = frappe.get_doc("Calendar View", calendar_view)
+    if calendar_view_doc.reference_doctype != "Event":
+        frappe.throw(_("Calendar View {0} does not show Events").format(frappe.bold(calendar_view)))
+
+    return get_calendar_view_filters(calendar_view_doc)
+
+
+def get_feed_validators(tables: list[str], conditions: str, values: dict, calendar_view: str | None):
+    """ETag and Last-Modified of the feed.
+
+    The ETag covers the newest change and the number of the feed's Events and the user's shares,
+    so it also changes on deletions. Last-Modified is the newest change alone.
+    """
+    event_modified, event_count = frappe.db.sql(
+        f"""SELECT max(`tabEvent`.modified), count(DISTINCT `tabEvent`.name)
+        FROM {", ".join(tables)}
+        WHERE {conditions}""",
+        values,
+    )[0]
+    share_modified, share_count = frappe.db.sql(
+        """SELECT max(modified), count(*)
+        FROM `tabDocShare`
+        WHERE share_doctype='Event' AND user=%(user)s""",
+        values,
+    )[0]
+
+    last_modified = max(filter(None, [event_modified, share_modified]), default=None)
+    fingerprint = "|".join(
+        str(part)
+        for part in (
+            values["user"],
+            calendar_view,
+            conditions,
+            values["cutoff"],
+            event_modified,
+            event_count,
+            share_modified,
+            share_count,
+        )
+    )
+    return hashlib.sha1(fingerprint.encode()).hexdigest(), to_utc(last_modified) if last_modified else None
+
+
+def iter_calendar(events: Iterable[frappe._dict], calendar_name: str) -> Iterator[bytes]:
+    """Yield the feed line by line, each folded and terminated as RFC 5545 requires."""
+    timezone = get_system_timezone()
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Globish//Globish Event Calendar//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(calendar_name)}",
+        f"X-WR-TIMEZONE:{timezone}",
+    ]
+    yield from map(fold_line, lines)
+    yield from map(fold_line, get_vtimezone_lines(timezone, getdate(nowdate()).year))
+
+    for event in events:
+        yield from map(fold_line, get_vevent_lines(event, timezone))
+
+    yield fold_line("END:VCALENDAR")
+
+
+def get_vevent_lines(event: frappe._dict, timezone: str) -> list[str]:
+    rrule = get_rrule(event, timezone) if event.repeat_this_event else None
+    if event.repeat_this_event and not rrule:
+        # e.g. a Weekly series without weekdays, which never occurs on the calendar either
+        return []
+
+    starts_on, ends_on = event.starts_on, event.ends_on
+    if rrule and event.repeat_on == "Weekly":
+        # DTSTART is always an occurrence, so the series starts on its first ticked weekday
+        shift = next(
+            offset for offset in range(7) if event.get(weekdays[(starts_on.weekday() + offset) % 7])
+        )
+        starts_on += timedelta(days=shift)
+        ends_on = ends_on + timedelta(days=shift) if ends_on else None
+        if event.repeat_till and getdate(starts_on) > getdate(event.repeat_till):
+            return []
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{event.name}@{frappe.local.site}",
+        f"DTSTAMP:{format_utc(event.modified)}",
+        f"LAST-MODIFIED:{format_utc(event.modified)}",
+        f"SUMMARY:{escape_text(strip_html(event.subject or ''))}",
+    ]
+
+    if event.all_day:
+        lines.append(f"DTSTART;VALUE=DATE:{getdate(starts_on):%Y%m%d}")
+        lines.append(f"DTEND;VALUE=DATE:{add_days(getdate(ends_on or starts_on), 1):%Y%m%d}")
+    else:
+        lines.append(f"DTSTART;TZID={timezone}:{starts_on:%Y%m%dT%H%M%S}")
+        if ends_on:
+            lines.append(f"DTEND;TZID={timezone}:{ends_on:%Y%m%dT%H%M%S}")
+
+    if rrule:
+        lines.append(f"RRULE:{rrule}")
+
+    if event.description:
+        lines.append(f"DESCRIPTION:{escape_text(strip_html(event.description))}")
+
+    if event.status == "Cancelled":
+        lines.append("STATUS:CANCELLED")
+
+    lines.append(f"URL:{get_url_to_form('Event', event.name)}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def get_rrule(event: frappe._dict, timezone: str) -> str | None:
+    """RRULE matching how custom_get_events expands `repeat_on`, the weekday flags and `repeat_till`."""
+    if event.repeat_on not in rrule_frequencies:
+        return None
+
+    frequency, interval = rrule_frequencies[event.repeat_on]
+    parts = [f"FREQ={frequency}"]
+    if interval > 1:
+        parts.append(f"INTERVAL={interval}")
+
+    if event.repeat_on == "Weekly":
+        days = [ical_day for fieldname, ical_day in zip(weekdays, ical_weekdays, strict=True) if event.get(fieldname)]
+        if not days:
+            return None
+
+        parts.append(f"BYDAY={','.join(days)}")
+
+    elif frequency in ("MONTHLY", "YEARLY") and event.starts_on.day > 28:
+        # series anchored past the 28th fall on the month's last day when the month is shorter,
+        # where a plain RRULE would skip those months altogether
+        if frequency == "YEARLY":
+            parts.append(f"BYMONTH={event.starts_on.month}")
+
+        parts.append(f"BYMONTHDAY={','.join(str(day) for day in range(28, event.starts_on.day + 1))}")
+        parts.append("BYSETPOS=-1")
+
+    if event.repeat_till:
+        if event.all_day:
+            parts.append(f"UNTIL={getdate(event.repeat_till):%Y%m%d}")
+        else:
+            until = datetime.combine(getdate(event.repeat_till), time(23, 59, 59))
+            parts.append(f"UNTIL={format_utc(until, timezone)}")
+
+    return ";".join(parts)
+
+
+@functools.lru_cache
+def get_vtimezone_lines(timezone: str, year: int) -> list[str]:
+    """VTIMEZONE for `timezone`, with the UTC offset changes of `year` repeated as yearly rules."""
+    zone = ZoneInfo(timezone)
+    lines = ["BEGIN:VTIMEZONE", f"TZID:{timezone}"]
+
+    transitions = get_offset_transitions(zone, year)
+    if not transitions:
+        local = datetime(year, 1, 1, tzinfo=ZoneInfo("UTC")).astimezone(zone)
+        lines.extend(
+            [
+                "BEGIN:STANDARD",
+                "DTSTART:19700101T000000",
+                f"TZOFFSETFROM:{format_offset(local.utcoffset())}",
+                f"TZOFFSETTO:{format_offset(local.utcoffset())}",
+                f"TZNAME:{local.tzname()}",
+                "END:STANDARD",
+            ]
+        )
+
+    for onset, before, after in transitions:
+        # the onset is written in the local time that was in effect before it
+        local_onset = (onset + before.utcoffset()).replace(tzinfo=None)
+        days_in_month = calendar.monthrange(local_onset.year, local_onset.month)[1]
+        nth = -1 if local_onset.day + 7 > days_in_month else (local_onset.day - 1) // 7 + 1
+        weekday = local_onset.weekday()
+        component = "DAYLIGHT" if after.dst() else "STANDARD"
+
+        lines.extend(
+            [
+                f"BEGIN:{component}",
+                f"DTSTART:{get_nth_weekday(1970, local_onset.month, weekday, nth):%Y%m%d}"
+                f"T{local_onset:%H%M%S}",
+                f"RRULE:FREQ=YEARLY;BYMONTH={local_onset.month};BYDAY={nth}{ical_weekdays[weekday]}",
+                f"TZOFFSETFROM:{format_offset(before.utcoffset())}",
+                f"TZOFFSETTO:{format_offset(after.utcoffset())}",
+                f"TZNAME:{after.tzname()}",
+                f"END:{component}",
+            ]
+        )
+
+    lines.append("END:VTIMEZONE")
+    return lines
+
+
+def get_offset_transitions(zone: ZoneInfo, year: int) -> list[tuple[datetime, datetime, datetime]]:
+    """UTC instants in `year` where `zone` changes its offset, each with the local times around it."""
+    utc = ZoneInfo("UTC")
+    start = datetime(year, 1, 1, tzinfo=utc)
+    end = datetime(year + 1, 1, 1, tzinfo=utc)
+
+    transitions = []
+    previous = start.astimezone(zone)
+    step = timedelta(hours=1)
+    instant = start + step
+    while instant < end:
+        current = instant.astimezone(zone)
+        if current.utcoffset() != previous.utcoffset():
+            # offsets change on the minute, so narrow the last hour down to it
+            onset = instant - step
+            while onset.astimezone(zone).utcoffset() == previous.utcoffset():
+                onset += timedelta(minutes=1)
+
+            transitions.append((onset, previous, onset.astimezone(zone)))
+
+        previous = current
+        instant += step
+
+    return transitions
+
+
+def get_nth_weekday(year: int, month: int, weekday: int, nth: int):
+    """Date of the `nth` `weekday` (0 is Monday) of the month, counting from the end when `nth` is -1."""
+    days = [
+        day
+        for day in calendar.Calendar().itermonthdates(year, month)
+        if day.month == month and day.weekday() == weekday
+    ]
+    return days[nth] if nth == -1 else days[nth - 1]
+
+
+def format_offset(offset: timedelta) -> str:
+    minutes = int(offset.total_seconds()) // 60
+    hours, minutes = divmod(abs(minutes), 60)
+    return f"{'-' if offset < timedelta(0) else '+'}{hours:02d}{minutes:02d}"
+
+
+def to_utc(value, timezone: str | None = None) -> datetime:
+    value = get_datetime(value)
+    return value.replace(tzinfo=ZoneInfo(timezone or get_system_timezone())).astimezone(ZoneInfo("UTC"))
+
+
+def format_utc(value, timezone: str | None = None) -> str:
+    return f"{to_utc(value, timezone):%Y%m%dT%H%M%SZ}"
+
+
+def escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str) -> bytes:
+    """Encode `line` with CRLF, folding it at 75 octets without splitting a UTF-8 character."""
+    data = line.encode()
+    chunks = []
+    limit = 75
+    while len(data) > limit:
+        cut = limit
+        while data[cut] & 0xC0 == 0x80:
+            cut -= 1
+
+        chunks.append(data[:cut])
+        data = data[cut:]
+        limit = 74  # continuation lines start with a space
+
+    chunks.append(data)
+    return b"\r\n ".join(chunks) + b"\r\n"
+
+
+def delete_feed_tokens(doc, method=None):
+    """Revoke the feed tokens of a User or Calendar View being deleted."""
+    fieldname = "user" if doc.doctype == "User" else "calendar_view"
+    frappe.db.delete(TOKEN_DOCTYPE, {fieldname: doc.name})
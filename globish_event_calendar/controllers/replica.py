@@ -0,0 +1,236 @@
+# This module routes the calendar's read-only endpoints to the read replica configured for the site
+# ("read_from_replica" and "replica_host" in site_config.json), the same replica frappe.read_only() uses.
+# Each endpoint tolerates a maximum replication lag set under the "calendar_read_replica" site config key;
+# when the replica lags further behind or cannot be reached, the call runs on the primary instead or,
+# if the endpoint asks for it, returns the last result cached for the same user and arguments.
+# A request or job opens at most one replica connection, closed by the after_request/after_job hooks.
+
+import functools
+import hashlib
+import json
+
+import frappe
+import pymysql
+
+REPLICA_SETTING = "calendar_read_replica"
+DEFAULT_MAX_STALENESS = 30  # seconds
+DEFAULT_CACHE_TTL = 600  # seconds
+
+# replication lag is shared by every request on the site, so it is measured at most this often
+LAG_CACHE_KEY = "calendar_replica_lag"
+LAG_CACHE_SECONDS = 2
+REPLICA_DOWN = -1
+# a replica that failed is not tried again for this long, so requests don't all wait on its connect timeout
+REPLICA_RETRY_SECONDS = 30
+
+# "Can't connect", "Can't connect (TCP)", "server has gone away", "lost connection during query"
+CONNECTION_ERROR_CODES = {2002, 2003, 2006, 2013}
+# "Access denied; you need (at least one of) the ... privilege(s)"
+SPECIFIC_ACCESS_DENIED = 1227
+GRANT_WARNING_KEY = "calendar_replica_grant_warning"
+GRANT_WARNING_SECONDS = 600
+
+
+def read_from_replica(endpoint: str):
+    """Run the decorated read-only function on the read replica when it is fresh enough.
+
+    `endpoint` names the entry under the "calendar_read_replica" site config key, e.g.
+
+        "calendar_read_replica": {
+            "custom_get_events": {"max_staleness": 30, "fallback": "cache"},
+            "get_calendar_view_events": {"max_staleness": 10}
+        }
+
+    `max_staleness` is the tolerated lag in seconds. `fallback` is "primary" (default) or
+    "cache", which serves the last result cached for the same user and arguments before
+    falling back to the primary. Results read from the replica or the cache are served without
+    their `modified` values, which may be older than the primary's, so a client moving a
+    document it fetched that way is not turned away by the conflict check of update_event.
+    If the replica connection fails during the call, the call is run again on the primary.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            settings = get_replica_settings(endpoint)
+            if not settings or frappe.flags.calendar_replica_routed:
+                # disabled, or an outer endpoint has already picked the connection
+                return fn(*args, **kwargs)
+
+            cache_key = get_result_cache_key(endpoint, args, kwargs) if settings.fallback == "cache" else None
+
+            def remember(result):
+                if cache_key:
+                    frappe.cache.set_value(cache_key, result, expires_in_sec=settings.cache_ttl)
+                return result
+
+            frappe.flags.calendar_replica_routed = True
+            try:
+                if switch_to_replica(settings.max_staleness):
+                    try:
+                        return without_modified(remember(fn(*args, **kwargs)))
+                    except Exception as e:
+                        if not is_connection_error(e):
+                            raise
+                        # reads are safe to repeat, so the call starts over without the replica
+                        mark_replica_down()
+                    finally:
+                        switch_to_primary()
+
+                if cache_key and (cached := frappe.cache.get_value(cache_key)) is not None:
+                    return without_modified(cached)
+
+                return remember(fn(*args, **kwargs))
+            finally:
+                frappe.flags.calendar_replica_routed = False
+
+        return wrapper
+
+    return decorator
+
+
+def get_replica_settings(endpoint: str) -> frappe._dict | None:
+    if not (frappe.conf.read_from_replica and frappe.conf.replica_host):
+        return None
+
+    settings = (frappe.conf.get(REPLICA_SETTING) or {}).get(endpoint) or {}
+    if isinstance(settings, int | float):
+        settings = {"max_staleness": settings}
+
+    return frappe._dict(
+        max_staleness=settings.get("max_staleness", DEFAULT_MAX_STALENESS),
+        fallback=settings.get("fallback", "primary"),
+        cache_ttl=settings.get("cache_ttl", DEFAULT_CACHE_TTL),
+    )
+
+
+def get_result_cache_key(endpoint: str, args, kwargs) -> str:
+    payload = json.dumps([frappe.session.user, args, kwargs], default=str, sort_keys=True)
+    return f"calendar_replica::{endpoint}::{hashlib.sha1(payload.encode()).hexdigest()}"
+
+
+def without_modified(result):
+    """`result` with the `modified` values dropped from its rows."""
+    if not isinstance(result, list):
+        return result
+
+    return [
+        frappe._dict({key: value for key, value in row.items() if key != "modified"})
+        if isinstance(row, dict)
+        else row
+        for row in result
+    ]
+
+
+def switch_to_replica(max_staleness) -> bool:
+    """Point `frappe.db` at the replica if its lag is within `max_staleness` seconds."""
+    lag = frappe.cache.get_value(LAG_CACHE_KEY)
+    if lag is not None and not is_fresh(lag, max_staleness):
+        return False
+
+    local = frappe.local
+    try:
+        if hasattr(local, "replica_db"):
+            # opened by an earlier call in this request
+            local.db = local.replica_db
+        else:
+            frappe.connect_replica()
+
+        if lag is None:
+            lag = get_replication_lag()
+            frappe.cache.set_value(
+                LAG_CACHE_KEY,
+                lag,
+                expires_in_sec=REPLICA_RETRY_SECONDS if lag == REPLICA_DOWN else LAG_CACHE_SECONDS,
+            )
+    except Exception:
+        mark_replica_down()
+        return False
+
+    if not is_fresh(lag, max_staleness):
+        switch_to_primary()
+        return False
+
+    # keeps frappe from writing through this connection (e.g. Error Logs are deferred instead)
+    frappe.flags.read_only = True
+    return True
+
+
+def switch_to_primary():
+    """Point `frappe.db` back at the primary, keeping the replica connection for later calls."""
+    if hasattr(frappe.local, "primary_db"):
+        frappe.local.db = frappe.local.primary_db
+
+    frappe.flags.read_only = False
+
+
+def close_replica():
+    """Close the replica connection of the request or job, if one was opened."""
+    local = frappe.local
+    if not hasattr(local, "replica_db"):
+        return
+
+    if hasattr(local, "primary_db"):
+        local.db = local.primary_db
+
+    try:
+        local.replica_db.close()
+    except Exception:
+        # the connection is already broken, which is often why it is being closed
+        pass
+
+    for attr in ("primary_db", "replica_db"):
+        if hasattr(local, attr):
+            delattr(local, attr)
+
+    frappe.flags.read_only = False
+
+
+def mark_replica_down():
+    frappe.cache.set_value(LAG_CACHE_KEY, REPLICA_DOWN, expires_in_sec=REPLICA_RETRY_SECONDS)
+    frappe.logger("globish_event_calendar").warning(
+        "Read replica unavailable, calendar reads use the primary", exc_info=True
+    )
+    close_replica()
+
+
+def get_replication_lag() -> int:
+    """Seconds the replica is behind the primary, or `REPLICA_DOWN` if replication is stopped.
+
+    Reading the replication status needs the REPLICATION CLIENT privilege (SLAVE MONITOR on
+    MariaDB 10.5 and later) for the site's database user on the replica. Without it the replica
+    is treated as down and an error is logged every few minutes.
+    """
+    try:
+        status = frappe.db.sql("SHOW SLAVE STATUS", as_dict=True)
+    except pymysql.OperationalError as e:
+        if e.args[0] != SPECIFIC_ACCESS_DENIED:
+            raise
+
+        if not frappe.cache.get_value(GRANT_WARNING_KEY):
+            frappe.cache.set_value(GRANT_WARNING_KEY, 1, expires_in_sec=GRANT_WARNING_SECONDS)
+            frappe.logger("globish_event_calendar").error(
+                "Cannot read the replication lag of the read replica, so calendar reads use the primary. "
+                "Grant the site's database user the privilege on the replica, e.g. "
+                f"GRANT SLAVE MONITOR ON *.* TO '{frappe.conf.db_name}'@'%' (MariaDB 10.5+) or "
+                f"GRANT REPLICATION CLIENT ON *.* TO '{frappe.conf.db_name}'@'%'. ({e.args[1]})"
+            )
+        return REPLICA_DOWN
+
+    if not status:
+        # not replicating from anywhere, so the server is as fresh as it gets
+        return 0
+
+    lag = status[0].get("Seconds_Behind_Master")
+    return REPLICA_DOWN if lag is None else int(lag)
+
+
+def is_fresh(lag: int, max_staleness) -> bool:
+    return lag != REPLICA_DOWN and lag <= max_staleness
+
+
+def is_connection_error(e: Exception) -> bool:
+    if isinstance(e, pymysql.InterfaceError):
+        return True
+
+    return isinstance(e, pymysql.OperationalError) and bool(e.args) and e.args[0] in CONNECTION_ERROR_CODES
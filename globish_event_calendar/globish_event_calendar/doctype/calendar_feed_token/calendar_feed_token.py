@@ -0,0 +1,21 @@
+# Copyright (c) 2026, Internal Use and contributors
+# For license information, please see license.txt
+
+from frappe.model.document import Document
+
+
+class CalendarFeedToken(Document):
+    # begin: auto-generated types
+    # This code is auto-generated. Do not modify anything in this block.
+
+    from typing import TYPE_CHECKING
+
+    if TYPE_CHECKING:
+        from frappe.types import DF
+
+        calendar_view: DF.Link | None
+        token_hash: DF.Data
+        user: DF.Link
+    # end: auto-generated types
+
+    pass
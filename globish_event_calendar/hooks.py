@@ -130,6 +130,14 @@ doctype_calendar_js = {"Event" : "public/js/custom_calendar.js"}
 # 	"Event": "frappe.desk.doctype.event.event.has_permission",
 # }
 
+# DocType Class
+# ---------------
+# Override standard doctype classes
+
+override_doctype_class = {
+	"Event": "globish_event_calendar.controllers.override.Event"
+}
+
 # Document Events
 # ---------------
 # Hook on document methods and events
@@ -141,6 +149,25 @@ doctype_calendar_js = {"Event" : "public/js/custom_calendar.js"}
 # 		"on_trash": "method"
 # 	}
 # }
+doc_events = {
+	"*": {
+		"on_trash": "globish_event_calendar.controllers.event_cache.on_document_trash",
+	},
+	"Event": {
+		"on_update": "globish_event_calendar.controllers.event_cache.on_event_change",
+		"on_trash": "globish_event_calendar.controllers.event_cache.on_event_change",
+	},
+	"DocShare": {
+		"on_update": "globish_event_calendar.controllers.event_cache.on_share_change",
+		"on_trash": "globish_event_calendar.controllers.event_cache.on_share_change",
+	},
+	"User": {
+		"on_trash": "globish_event_calendar.controllers.ics.delete_feed_tokens",
+	},
+	"Calendar View": {
+		"on_trash": "globish_event_calendar.controllers.ics.delete_feed_tokens",
+	},
+}
 
 # Scheduled Tasks
 # ---------------
@@ -162,6 +189,11 @@ doctype_calendar_js = {"Event" : "public/js/custom_calendar.js"}
 # 		"globish_event_calendar.tasks.monthly"
 # 	],
 # }
+scheduler_events = {
+	"daily": [
+		"globish_event_calendar.controllers.override.set_status_of_events",
+	],
+}
 
 # Testing
 # -------
@@ -173,7 +205,8 @@ doctype_calendar_js = {"Event" : "public/js/custom_calendar.js"}
 #
 override_whitelisted_methods = {
 	"frappe.desk.doctype.event.event.get_events": "globish_event_calendar.controllers.override.custom_get_events",
-    "frappe.desk.calendar.get_events": "globish_event_calendar.controllers.override.get_calendar_view_events"
+    "frappe.desk.calendar.get_events": "globish_event_calendar.controllers.override.get_calendar_view_events",
+    "frappe.desk.calendar.update_event": "globish_event_calendar.controllers.override.custom_update_event"
 }
 #
 # each overriding function accepts a `data` argument;
@@ -196,11 +229,13 @@ override_whitelisted_methods = {
 # ----------------
 # before_request = ["globish_event_calendar.utils.before_request"]
 # after_request = ["globish_event_calendar.utils.after_request"]
+after_request = ["globish_event_calendar.controllers.replica.close_replica"]
 
 # Job Events
 # ----------
 # before_job = ["globish_event_calendar.utils.before_job"]
 # after_job = ["globish_event_calendar.utils.after_job"]
+after_job = ["globish_event_calendar.controllers.replica.close_replica"]
 
 # User Data Protection
 # --------------------
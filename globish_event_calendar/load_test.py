@@ -0,0 +1,424 @@
+# This module is a load-test harness for the calendar endpoints this app overrides.
+# It seeds a local site with synthetic users, Events (one-off and repeating, Public and Private, some shared)
+# and Event Calendar Views, then replays a weighted mix of FullCalendar traffic over HTTP against a running bench:
+# fetches through frappe.desk.doctype.event.event.get_events and frappe.desk.calendar.get_events with the Referer
+# headers, windows and filters the desk sends, drag/drop moves through frappe.desk.calendar.update_event and
+# full Event saves. It reports throughput and p50/p95/p99 latency per endpoint, plus the database queries each
+# endpoint issues, measured serially from the server's "Questions" counter before the concurrent run.
+# Moves send the `modified` value last seen for the Event, like the calendar does, so concurrent edits of the
+# same Event are reported as conflicts rather than errors.
+# The commands live in commands.py: bench --site SITE calendar-load-test-seed / calendar-load-test.
+
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import frappe
+import frappe.share
+import requests
+from frappe.utils import add_days, get_datetime, getdate, nowdate
+
+SUBJECT_PREFIX = "[loadtest]"
+USER_DOMAIN = "loadtest.example.com"
+VIEW_PREFIX = "loadtest"
+PASSWORD = "loadtest-Password-1"
+
+EVENT_FIELD_MAP = {
+    "id": "name",
+    "start": "starts_on",
+    "end": "ends_on",
+    "allDay": "all_day",
+    "title": "subject",
+}
+
+# share of each request type in the replayed traffic
+DEFAULT_MIX = {
+    "event.get_events": 45,
+    "calendar.get_events": 35,
+    "calendar.update_event": 12,
+    "event.save": 8,
+}
+
+# (name, days) of the windows FullCalendar asks for in month, week and day views
+WINDOWS = [("month", 42), ("week", 7), ("day", 1)]
+
+REPEAT_ON = ["Daily", "Weekly", "Monthly", "Quarterly", "Half Yearly", "Yearly"]
+
+
+def seed_dataset(
+    users: int = 20,
+    events: int = 2000,
+    views: int = 3,
+    private_ratio: float = 0.3,
+    recurring_ratio: float = 0.2,
+    share_ratio: float = 0.1,
+    random_seed: int = 0,
+):
+    """Create the synthetic users, Events and Calendar Views, replacing any earlier load-test data."""
+    clear_dataset()
+    rng = random.Random(random_seed)
+    today = getdate(nowdate())
+
+    user_names = []
+    for i in range(users):
+        user = frappe.get_doc(
+            {
+                "doctype": "User",
+                "email": f"user{i}@{USER_DOMAIN}",
+                "first_name": f"Load Test {i}",
+                "user_type": "System User",
+                "send_welcome_email": 0,
+                "new_password": PASSWORD,
+            }
+        ).insert(ignore_permissions=True)
+        user_names.append(user.name)
+
+    for i in range(views):
+        frappe.get_doc(
+            {
+                "doctype": "Calendar View",
+                "reference_doctype": "Event",
+                "subject_field": "subject",
+                "start_date_field": "starts_on",
+                "end_date_field": "ends_on",
+                "custom_filters": json.dumps([["Event", "event_type", "=", "Public"]] if i % 2 else []),
+            }
+        ).insert(ignore_permissions=True, set_name=f"{VIEW_PREFIX}-{i}")
+
+    for i in range(events):
+        owner = rng.choice(user_names)
+        starts_on = datetime.combine(add_days(today, rng.randint(-180, 180)), datetime.min.time()) + timedelta(
+            minutes=rng.randrange(7 * 60, 19 * 60, 15)
+        )
+        event = {
+            "doctype": "Event",
+            "subject": f"{SUBJECT_PREFIX} Event {i}",
+            "event_type": "Private" if rng.random() < private_ratio else "Public",
+            "starts_on": starts_on,
+            "ends_on": starts_on + timedelta(minutes=rng.choice([15, 30, 60, 90])),
+        }
+        if rng.random() < recurring_ratio:
+            event.update(
+                {
+                    "repeat_this_event": 1,
+                    "repeat_on": rng.choice(REPEAT_ON),
+                    "repeat_till": add_days(starts_on.date(), rng.randint(30, 720)) if rng.random() < 0.7 else None,
+                    rng.choice(["monday", "tuesday", "wednesday", "thursday", "friday"]): 1,
+                }
+            )
+
+        frappe.set_user(owner)
+        doc = frappe.get_doc(event).insert()
+        frappe.set_user("Administrator")
+
+        if doc.event_type == "Private" and rng.random() < share_ratio:
+            frappe.share.add_docshare(
+                "Event", doc.name, rng.choice(user_names), write=1, flags={"ignore_share_permission": True}
+            )
+
+    frappe.db.commit()
+
+
+def clear_dataset():
+    """Delete everything `seed_dataset` created."""
+    for name in frappe.get_all("Event", filters={"subject": ("like", f"{SUBJECT_PREFIX}%")}, pluck="name"):
+        frappe.delete_doc("Event", name, force=True, ignore_permissions=True)
+
+    for name in frappe.get_all("Calendar View", filters={"name": ("like", f"{VIEW_PREFIX}-%")}, pluck="name"):
+        frappe.delete_doc("Calendar View", name, force=True, ignore_permissions=True)
+
+    for name in frappe.get_all("User", filters={"name": ("like", f"%@{USER_DOMAIN}")}, pluck="name"):
+        frappe.delete_doc("User", name, force=True, ignore_permissions=True)
+
+    frappe.db.commit()
+
+
+def run_load_test(
+    url: str,
+    duration: int = 60,
+    concurrency: int = 16,
+    mix: dict | None = None,
+    calibration_requests: int = 20,
+    random_seed: int = 0,
+) -> dict:
+    """Replay calendar traffic against `url` and return per-endpoint statistics."""
+    mix = mix or DEFAULT_MIX
+    rng = random.Random(random_seed)
+    users = frappe.get_all("User", filters={"name": ("like", f"%@{USER_DOMAIN}")}, pluck="name")
+    if not users:
+        frappe.throw("No load-test data found, run calendar-load-test-seed first")
+
+    context = frappe._dict(
+        url=url.rstrip("/"),
+        host=frappe.local.site,
+        views=frappe.get_all("Calendar View", filters={"name": ("like", f"{VIEW_PREFIX}-%")}, pluck="name"),
+        movable=frappe.get_all(
+            "Event",
+            filters={"subject": ("like", f"{SUBJECT_PREFIX}%"), "repeat_this_event": 0},
+            fields=["name", "owner", "starts_on", "ends_on", "modified"],
+        ),
+        today=getdate(nowdate()),
+        # guards the `movable` Events, whose times and `modified` the workers update after each move
+        event_lock=threading.Lock(),
+    )
+    sessions = {user: login(context, user) for user in users}
+
+    query_counts = {
+        endpoint: count_queries(context, sessions, endpoint, calibration_requests, rng) for endpoint in mix
+    }
+
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    conflicts = defaultdict(int)
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker(worker_rng: random.Random):
+        while time.monotonic() < deadline:
+            endpoint = worker_rng.choices(list(mix), weights=list(mix.values()))[0]
+            latency, outcome = send_request(context, sessions, endpoint, worker_rng)
+            with lock:
+                samples[endpoint].append(latency)
+                if outcome == "error":
+                    errors[endpoint] += 1
+                elif outcome == "conflict":
+                    conflicts[endpoint] += 1
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(worker, random.Random(random_seed + i + 1)) for i in range(concurrency)]
+        # re-raises anything that stopped a worker early instead of reporting a shorter run
+        for future in futures:
+            future.result()
+    elapsed = time.monotonic() - started
+
+    report = {
+        endpoint: summarize(
+            samples[endpoint], errors[endpoint], conflicts[endpoint], elapsed, query_counts[endpoint]
+        )
+        for endpoint in mix
+    }
+    report["total"] = summarize(
+        [latency for latencies in samples.values() for latency in latencies],
+        sum(errors.values()),
+        sum(conflicts.values()),
+        elapsed,
+        None,
+    )
+    return report
+
+
+def login(context: frappe._dict, user: str) -> requests.Session:
+    session = requests.Session()
+    session.headers["Host"] = context.host
+    response = session.post(f"{context.url}/api/method/login", data={"usr": user, "pwd": PASSWORD})
+    response.raise_for_status()
+    session.headers["X-Frappe-CSRF-Token"] = get_csrf_token(session.cookies.get("sid"))
+    return session
+
+
+def get_csrf_token(sid: str) -> str:
+    """CSRF token of the session `sid`, created in its cached session data if the session has none yet.
+
+    The desk gets the token with its boot; an API login does not, so it is read (or set) where
+    frappe validates it from.
+    """
+    session_data = frappe.cache.hget("session", sid)
+    if not session_data:
+        frappe.throw(f"Session {sid} was not found in the cache")
+
+    if not session_data["data"].get("csrf_token"):
+        session_data["data"]["csrf_token"] = frappe.generate_hash()
+        frappe.cache.hset("session", sid, session_data)
+
+    return session_data["data"]["csrf_token"]
+
+
+def send_request(context: frappe._dict, sessions: dict, endpoint: str, rng: random.Random):
+    """Send one request of type `endpoint` as a random user.
+
+    Returns the latency in seconds and the outcome: "ok", "conflict" (the Event changed since
+    its `modified` was last seen) or "error".
+    """
+    if endpoint == "calendar.update_event":
+        event = rng.choice(context.movable)
+        session = sessions[event.owner]
+    else:
+        event = rng.choice(context.movable) if endpoint == "event.save" else None
+        session = sessions[event.owner] if event else rng.choice(list(sessions.values()))
+
+    if event:
+        # a consistent copy, so a move never pairs new times with an old `modified`
+        with context.event_lock:
+            snapshot = frappe._dict(event)
+    else:
+        snapshot = None
+
+    method, path, params, headers = build_request(context, endpoint, snapshot, rng)
+    started = time.monotonic()
+    try:
+        response = session.request(method, f"{context.url}{path}", headers=headers, **params)
+    except requests.RequestException:
+        return time.monotonic() - started, "error"
+
+    latency = time.monotonic() - started
+    if response.status_code == 417:
+        # TimestampMismatchError: another worker moved or saved the Event first
+        return latency, "conflict"
+
+    if not response.ok:
+        return latency, "error"
+
+    if event:
+        message = response.json().get("message")
+        with context.event_lock:
+            remember_event_state(event, endpoint, params, message)
+
+    return latency, "ok"
+
+
+def remember_event_state(event: frappe._dict, endpoint: str, params: dict, message):
+    """Keep the times and `modified` the server now has for `event`, for the next move.
+
+    Called with `context.event_lock` held.
+    """
+    if endpoint == "calendar.update_event":
+        move = json.loads(params["data"]["args"])
+        event.starts_on = get_datetime(move["starts_on"])
+        event.ends_on = get_datetime(move["ends_on"])
+        event.modified = message[0]["modified"]
+    else:
+        event.modified = message["modified"]
+
+
+def build_request(context: frappe._dict, endpoint: str, event: frappe._dict | None, rng: random.Random):
+    """Method, path, requests kwargs and headers for one request, shaped like the desk's calls."""
+    _window_name, days = rng.choice(WINDOWS)
+    start = add_days(context.today, rng.randint(-60, 60))
+    end = add_days(start, days)
+
+    if endpoint == "event.get_events":
+        filters = rng.choice([[], [["Event", "event_type", "=", "Public"]], [["Event", "status", "=", "Open"]]])
+        return (
+            "GET",
+            "/api/method/frappe.desk.doctype.event.event.get_events",
+            {"params": {"start": str(start), "end": str(end), "filters": json.dumps(filters)}},
+            {"Referer": f"{context.url}/app/event/view/calendar/default"},
+        )
+
+    if endpoint == "calendar.get_events":
+        view = rng.choice(context.views) if context.views else "default"
+        return (
+            "GET",
+            "/api/method/frappe.desk.calendar.get_events",
+            {
+                "params": {
+                    "doctype": "Event",
+                    "start": f"{start} 00:00:00",
+                    "end": f"{end} 00:00:00",
+                    "field_map": json.dumps(EVENT_FIELD_MAP),
+                    "filters": json.dumps([]),
+                }
+            },
+            {"Referer": f"{context.url}/app/event/view/calendar/{view}"},
+        )
+
+    if endpoint == "calendar.update_event":
+        shift = timedelta(days=rng.randint(-3, 3), minutes=rng.choice([-60, -30, 0, 30, 60]))
+        args = {
+            "doctype": "Event",
+            "name": event.name,
+            "starts_on": str(event.starts_on + shift),
+            "ends_on": str(event.ends_on + shift),
+            "all_day": 0,
+            "modified": str(event.modified),
+        }
+        return (
+            "POST",
+            "/api/method/frappe.desk.calendar.update_event",
+            {"data": {"args": json.dumps(args), "field_map": json.dumps(EVENT_FIELD_MAP)}},
+            {"Referer": f"{context.url}/app/event/view/calendar/default"},
+        )
+
+    return (
+        "POST",
+        "/api/method/frappe.client.set_value",
+        {
+            "data": {
+                "doctype": "Event",
+                "name": event.name,
+                "fieldname": "description",
+                "value": f"Edited at {datetime.now():%H:%M:%S}",
+            }
+        },
+        {"Referer": f"{context.url}/app/event/{event.name}"},
+    )
+
+
+def count_queries(
+    context: frappe._dict, sessions: dict, endpoint: str, requests_count: int, rng: random.Random
+) -> float | None:
+    """Average statements per request, from the server-wide counter while requests run one at a time.
+
+    The counter covers every client of the database server, so run this on an otherwise idle bench.
+    """
+    if not requests_count:
+        return None
+
+    # reading the counter is a statement too
+    first_reading = get_questions()
+    reading_cost = get_questions() - first_reading
+
+    before = get_questions()
+    for _ in range(requests_count):
+        send_request(context, sessions, endpoint, rng)
+    after = get_questions()
+
+    return max(0, after - before - reading_cost) / requests_count
+
+
+def get_questions() -> int:
+    return int(frappe.db.sql("SHOW GLOBAL STATUS LIKE 'Questions'")[0][1])
+
+
+def summarize(
+    latencies: list[float], errors: int, conflicts: int, elapsed: float, queries: float | None
+) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "conflicts": conflicts,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "queries_per_request": queries,
+    }
+
+
+def percentile(sorted_values: list[float], percent: int) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[rank - 1]
+
+
+def format_report(report: dict) -> str:
+    header = f"{'endpoint':<24}{'requests':>10}{'errors':>8}{'conflicts':>11}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}"
+    lines = [header, "-" * len(header)]
+    for endpoint, stats in report.items():
+        queries = "-" if stats["queries_per_request"] is None else f"{stats['queries_per_request']:.1f}"
+        lines.append(
+            f"{endpoint:<24}{stats['requests']:>10}{stats['errors']:>8}{stats['conflicts']:>11}"
+            f"{stats['throughput']:>9.1f}"
+            f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}{queries:>9}"
+        )
+
+    return "\n".join(lines)
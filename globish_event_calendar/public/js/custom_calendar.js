@@ -227,11 +227,42 @@ frappe.views.Calendar = class Calendar {
             }
         });
 
+        if (me.doctype === "Event") {
+            me.page.add_menu_item(__("Subscribe in Calendar App"), function () {
+                me.show_feed_url();
+            });
+        }
+
         $(this.parent).on("show", function () {
             me.$cal.fullCalendar("refetchEvents");
         });
     }
 
+    show_feed_url() {
+        const calendar_name = this.list_view.calendar_name;
+        frappe.confirm(
+            __(
+                "A new feed link will be created for this calendar and its earlier link will stop working. Continue?"
+            ),
+            () => {
+                frappe.call({
+                    method: "globish_event_calendar.controllers.ics.generate_calendar_feed_token",
+                    args: {
+                        calendar_view: calendar_name !== "default" ? calendar_name : null,
+                    },
+                    callback: function (r) {
+                        if (r.message) {
+                            frappe.msgprint({
+                                title: __("iCalendar Feed"),
+                                message: __("Add this link to your calendar app:") + `<pre>${r.message}</pre>`,
+                            });
+                        }
+                    },
+                });
+            }
+        );
+    }
+
     make() {
         this.$wrapper = this.parent;
         this.$cal = $("<div>").appendTo(this.$wrapper);
@@ -564,7 +595,25 @@ frappe.views.Calendar = class Calendar {
                 if (r.exc) {
                     frappe.show_alert(__("Unable to update event"));
                     revertFunc();
+                    return;
                 }
+
+                // keep the timestamp current so the next move passes the modified check;
+                // every occurrence of a repeating series shares the series' name and modified
+                (r.message || []).forEach((updated) => {
+                    const occurrences = me.$cal.fullCalendar(
+                        "clientEvents",
+                        (e) => e.name === updated.name
+                    );
+                    occurrences.forEach((e) => {
+                        e.modified = updated.modified;
+                    });
+
+                    if (occurrences.length > 1) {
+                        // moving one occurrence moves the whole series, so redraw the others
+                        me.$cal.fullCalendar("refetchEvents");
+                    }
+                });
             },
             error: function () {
                 revertFunc();
@@ -598,6 +647,10 @@ frappe.views.Calendar = class Calendar {
 
         args.doctype = event.doctype || this.doctype;
 
+        if (event.modified) {
+            args.modified = event.modified;
+        }
+
         return { args: args, field_map: this.field_map };
     }
 
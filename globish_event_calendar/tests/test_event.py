@@ -0,0 +1,168 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import frappe
+from frappe.custom.doctype.property_setter.property_setter import make_property_setter
+from frappe.desk.doctype.event.event import Event as FrappeEvent
+from frappe.tests.utils import FrappeTestCase
+from rq.job import JobStatus
+
+from globish_event_calendar.controllers.override import (
+    COMMUNICATION_SYNC_SETTING,
+    sync_event_communication,
+)
+
+
+class TestEventCommunicationSync(FrappeTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        make_property_setter("Contact", None, "allow_events_in_timeline", 1, "Check", for_doctype=True)
+        cls.contact = frappe.get_doc({"doctype": "Contact", "first_name": "Timeline Participant"}).insert()
+
+    def save_event(self):
+        """Insert an Event with a participant, then move and rename it."""
+        event = frappe.get_doc(
+            {
+                "doctype": "Event",
+                "subject": "Communication sync",
+                "event_category": "Meeting",
+                "starts_on": "2026-01-05 10:00:00",
+                "ends_on": "2026-01-05 11:00:00",
+                "event_participants": [
+                    {"reference_doctype": "Contact", "reference_docname": self.contact.name},
+                ],
+            }
+        ).insert()
+        event.subject = "Communication sync (moved)"
+        event.starts_on = "2026-01-06 09:00:00"
+        event.ends_on = "2026-01-06 10:00:00"
+        event.save()
+        return event.name
+
+    def get_timeline(self, event):
+        communications = frappe.get_all(
+            "Communication",
+            filters={"reference_doctype": "Event", "reference_name": event},
+            fields=[
+                "name",
+                "subject",
+                "content",
+                "communication_date",
+                "communication_medium",
+                "sender",
+                "status",
+            ],
+            order_by="creation",
+        )
+        for communication in communications:
+            communication.links = frappe.get_all(
+                "Communication Link",
+                filters={"parent": communication.pop("name")},
+                fields=["link_doctype", "link_name"],
+                order_by="idx",
+            )
+
+        return communications
+
+    def save_deferred(self, job_status=JobStatus.QUEUED):
+        """Save an Event in deferred mode and return it with the jobs that were enqueued."""
+        jobs = []
+        with (
+            patch.dict(frappe.conf, {COMMUNICATION_SYNC_SETTING: "deferred"}),
+            patch("frappe.enqueue", side_effect=lambda method, **kwargs: jobs.append(kwargs)),
+            patch(
+                "globish_event_calendar.controllers.override.get_job",
+                return_value=MagicMock(get_status=MagicMock(return_value=job_status)),
+            ),
+        ):
+            event = self.save_event()
+            frappe.db.after_commit.run()
+
+        return event, jobs
+
+    def test_deferred_sync_matches_sync(self):
+        with patch.dict(frappe.conf, {COMMUNICATION_SYNC_SETTING: "sync"}):
+            expected = self.get_timeline(self.save_event())
+
+        event, jobs = self.save_deferred()
+        self.assertEqual(self.get_timeline(event), [])
+
+        for job in jobs:
+            sync_event_communication(job["event"])
+
+        self.assertTrue(expected)
+        self.assertEqual(self.get_timeline(event), expected)
+
+    def test_saves_collapse_into_queued_job(self):
+        _event, jobs = self.save_deferred(job_status=JobStatus.QUEUED)
+        self.assertEqual(len(jobs), 1)
+
+    def test_save_during_running_job_gets_own_run(self):
+        _event, jobs = self.save_deferred(job_status=JobStatus.STARTED)
+        self.assertEqual(len(jobs), 2)
+
+    def test_concurrent_jobs_create_one_communication(self):
+        # the jobs run on connections of their own, so they only see committed data
+        contact = frappe.get_doc({"doctype": "Contact", "first_name": "Concurrent Participant"}).insert()
+        with (
+            patch.dict(frappe.conf, {COMMUNICATION_SYNC_SETTING: "deferred"}),
+            patch("frappe.enqueue"),
+        ):
+            event = frappe.get_doc(
+                {
+                    "doctype": "Event",
+                    "subject": "Concurrent communication sync",
+                    "event_category": "Meeting",
+                    "starts_on": "2026-01-05 10:00:00",
+                    "event_participants": [
+                        {"reference_doctype": "Contact", "reference_docname": contact.name},
+                    ],
+                }
+            ).insert()
+            frappe.db.commit()
+
+        self.addCleanup(self.delete_committed, event.name, contact.name)
+
+        site, sites_path = frappe.local.site, frappe.local.sites_path
+        start = threading.Barrier(2)
+        errors = []
+
+        def run_job():
+            frappe.init(site=site, sites_path=sites_path)
+            frappe.connect()
+            try:
+                start.wait()
+                sync_event_communication(event.name)
+                frappe.db.commit()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                frappe.destroy()
+
+        sync_communication = FrappeEvent.sync_communication
+
+        def slow_sync_communication(doc):
+            # holds the first job inside the sync while the second one starts
+            time.sleep(1)
+            sync_communication(doc)
+
+        with patch.object(FrappeEvent, "sync_communication", slow_sync_communication):
+            jobs = [threading.Thread(target=run_job) for _ in range(2)]
+            for job in jobs:
+                job.start()
+            for job in jobs:
+                job.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            frappe.db.count("Communication", {"reference_doctype": "Event", "reference_name": event.name}),
+            1,
+        )
+
+    def delete_committed(self, event, contact):
+        frappe.db.delete("Communication", {"reference_doctype": "Event", "reference_name": event})
+        frappe.delete_doc("Event", event, force=True)
+        frappe.delete_doc("Contact", contact, force=True)
+        frappe.db.commit()
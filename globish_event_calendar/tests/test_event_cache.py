@@ -0,0 +1,149 @@
+from unittest.mock import MagicMock, patch
+
+import frappe
+import frappe.share
+from frappe.tests.utils import FrappeTestCase
+
+from globish_event_calendar.controllers import event_cache
+
+JANUARY = ("2026-01-01", "2026-01-31", "")
+MARCH = ("2026-03-01", "2026-03-31", "")
+OWNER = "Administrator"
+SHARED_WITH = "test@example.com"
+OTHER_USER = "test1@example.com"
+
+
+class TestEventCache(FrappeTestCase):
+    def setUp(self):
+        for window in (JANUARY, MARCH):
+            event_cache.get_public_events(window, list)
+
+        for user in (OWNER, SHARED_WITH, OTHER_USER):
+            event_cache.get_user_events(user, JANUARY, list)
+
+    def tearDown(self):
+        frappe.cache.delete_value(event_cache.PARTICIPANT_DOCTYPES_KEY)
+
+    def change_public_event(self, **values):
+        event_cache.clear_event(
+            frappe._dict(
+                name="_Test Cached Event",
+                event_type="Public",
+                owner="Administrator",
+                starts_on="2026-01-10 10:00:00",
+                ends_on="2026-01-10 11:00:00",
+                repeat_this_event=0,
+                **values,
+            )
+        )
+        frappe.db.after_commit.run()
+
+    def assertRebuilt(self, window, rebuilt=True, user=None):
+        """Assert whether the Public layer, or the overlay of `user`, rebuilds `window`."""
+        build = MagicMock(return_value=[])
+        if user:
+            event_cache.get_user_events(user, window, build)
+        else:
+            event_cache.get_public_events(window, build)
+        self.assertEqual(build.called, rebuilt)
+
+    def make_private_event(self):
+        event = frappe.get_doc(
+            {
+                "doctype": "Event",
+                "subject": "_Test Cached Private Event",
+                "event_type": "Private",
+                "starts_on": "2026-01-12 10:00:00",
+                "ends_on": "2026-01-12 11:00:00",
+            }
+        ).insert()
+        frappe.db.after_commit.run()
+        for user in (OWNER, SHARED_WITH, OTHER_USER):
+            event_cache.get_user_events(user, JANUARY, list)
+        event_cache.get_public_events(JANUARY, list)
+        return event
+
+    def test_one_off_event_only_drops_its_months(self):
+        self.change_public_event()
+        self.assertRebuilt(JANUARY)
+        self.assertRebuilt(MARCH, rebuilt=False)
+
+    def test_series_drops_every_window(self):
+        self.change_public_event(repeat_this_event=1)
+        self.assertRebuilt(JANUARY)
+        self.assertRebuilt(MARCH)
+
+    def test_deleted_participant_drops_every_window(self):
+        frappe.cache.set_value(event_cache.PARTICIPANT_DOCTYPES_KEY, ["Contact"])
+        event_cache.on_document_trash(frappe._dict(doctype="Contact"))
+        frappe.db.after_commit.run()
+        self.assertRebuilt(JANUARY)
+        self.assertRebuilt(MARCH)
+
+    def test_share_changes_drop_the_shared_users_overlay(self):
+        event = self.make_private_event()
+
+        frappe.share.add_docshare("Event", event.name, SHARED_WITH, flags={"ignore_share_permission": True})
+        frappe.db.after_commit.run()
+        self.assertRebuilt(JANUARY, user=SHARED_WITH)
+        self.assertRebuilt(JANUARY, user=OTHER_USER, rebuilt=False)
+        self.assertRebuilt(JANUARY, rebuilt=False)
+
+        frappe.share.remove("Event", event.name, SHARED_WITH, flags={"ignore_share_permission": True})
+        frappe.db.after_commit.run()
+        self.assertRebuilt(JANUARY, user=SHARED_WITH)
+        self.assertRebuilt(JANUARY, user=OTHER_USER, rebuilt=False)
+
+    def test_private_to_public_drops_both_layers(self):
+        event = self.make_private_event()
+
+        event.event_type = "Public"
+        event.save()
+        frappe.db.after_commit.run()
+        self.assertRebuilt(JANUARY, user=OWNER)
+        self.assertRebuilt(JANUARY)
+        self.assertRebuilt(JANUARY, user=OTHER_USER, rebuilt=False)
+        self.assertRebuilt(MARCH, rebuilt=False)
+
+    def test_stats_count_hits_and_misses_across_the_site(self):
+        before = event_cache.get_cache_stats()["user"]
+        event_cache.get_user_events(OTHER_USER, JANUARY, list)
+        event_cache.get_user_events(OTHER_USER, MARCH, list)
+        after = event_cache.get_cache_stats()["user"]
+
+        self.assertEqual(after["hits"] - before["hits"], 1)
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hit_rate"], after["hits"] / (after["hits"] + after["misses"]))
+
+    def test_replica_entries_keep_a_short_ttl(self):
+        with patch.dict(frappe.conf, {event_cache.CACHE_SETTING: {"ttl": 600}}):
+            self.assertEqual(event_cache.get_ttl(), 600)
+            with patch.dict(frappe.flags, {"read_only": True}):
+                self.assertEqual(event_cache.get_ttl(), event_cache.REPLICA_ENTRY_TTL)
+
+
+class TestLRUCache(FrappeTestCase):
+    def test_evicts_least_recently_used_at_maxsize(self):
+        cache = event_cache.LRUCache(maxsize=2)
+        cache.set("a", [1], ttl=60)
+        cache.set("b", [2], ttl=60)
+        cache.get("a")
+        cache.set("c", [3], ttl=60)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), [1])
+        self.assertEqual(cache.get("c"), [3])
+        self.assertEqual(cache.stats(), {"size": 2, "maxsize": 2})
+
+    def test_entries_expire_after_ttl(self):
+        cache = event_cache.LRUCache(maxsize=2)
+        with patch.object(event_cache.time, "monotonic", return_value=1000.0):
+            cache.set("a", [1], ttl=60)
+
+        with patch.object(event_cache.time, "monotonic", return_value=1059.0):
+            self.assertEqual(cache.get("a"), [1])
+
+        with patch.object(event_cache.time, "monotonic", return_value=1061.0):
+            self.assertIsNone(cache.get("a"))
+
+        self.assertEqual(cache.stats()["size"], 0)
@@ -0,0 +1,46 @@
+from urllib.parse import parse_qs, urlparse
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from globish_event_calendar.controllers.ics import generate_calendar_feed_token, get_feed_user
+
+
+def get_token(calendar_view=None):
+    url = generate_calendar_feed_token(calendar_view)
+    return parse_qs(urlparse(url).query)["token"][0]
+
+
+class TestCalendarFeedToken(FrappeTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.view = frappe.get_doc(
+            {
+                "doctype": "Calendar View",
+                "reference_doctype": "Event",
+                "subject_field": "subject",
+                "start_date_field": "starts_on",
+                "end_date_field": "ends_on",
+                "custom_filters": "[]",
+            }
+        ).insert(set_name="_Test Feed View")
+
+    def test_each_view_has_its_own_token(self):
+        all_events = get_token()
+        view = get_token(self.view.name)
+
+        self.assertEqual(get_feed_user(all_events, None), frappe.session.user)
+        self.assertEqual(get_feed_user(view, self.view.name), frappe.session.user)
+
+        # a token does not open the feed of another view
+        self.assertRaises(frappe.AuthenticationError, get_feed_user, view, None)
+
+    def test_renewing_a_view_only_revokes_its_own_token(self):
+        all_events = get_token()
+        old_view = get_token(self.view.name)
+        new_view = get_token(self.view.name)
+
+        self.assertRaises(frappe.AuthenticationError, get_feed_user, old_view, self.view.name)
+        self.assertEqual(get_feed_user(new_view, self.view.name), frappe.session.user)
+        self.assertEqual(get_feed_user(all_events, None), frappe.session.user)
@@ -0,0 +1,42 @@
+import random
+from datetime import date
+
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, add_months
+
+from globish_event_calendar.controllers.override import iter_month_occurrences, month_periods
+
+
+def brute_force_occurrences(anchor: date, period: int, start: date, end: date) -> list[date]:
+    """Every occurrence of the series from its anchor on, keeping those inside the window."""
+    occurrences = []
+    index = 0
+    while (target_date := add_months(anchor, index * period)) <= end:
+        if target_date >= start:
+            occurrences.append(target_date)
+        index += 1
+
+    return occurrences
+
+
+class TestMonthOccurrences(FrappeTestCase):
+    def test_matches_brute_force(self):
+        rng = random.Random(20261019)
+        for _ in range(2000):
+            # anchors late in the month exercise the clamping to shorter months
+            anchor = add_days(date(rng.randint(2000, 2030), rng.randint(1, 12), 1), rng.randint(0, 30))
+            period = rng.choice(list(month_periods.values()))
+            start = add_days(anchor, rng.randint(-400, 4000))
+            end = add_days(start, rng.randint(0, 800))
+
+            with self.subTest(anchor=anchor, period=period, start=start, end=end):
+                self.assertEqual(
+                    list(iter_month_occurrences(anchor, period, start, end)),
+                    brute_force_occurrences(anchor, period, start, end),
+                )
+
+    def test_clamps_to_month_end(self):
+        self.assertEqual(
+            list(iter_month_occurrences(date(2024, 1, 31), 1, date(2024, 2, 1), date(2024, 4, 30))),
+            [date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)],
+        )
@@ -0,0 +1,138 @@
+import json
+import time
+import unittest
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import now_datetime
+
+from globish_event_calendar.controllers.replica import (
+    LAG_CACHE_KEY,
+    REPLICA_DOWN,
+    REPLICA_SETTING,
+    close_replica,
+    read_from_replica,
+)
+from globish_event_calendar.controllers.override import custom_get_events, custom_update_event
+
+ENDPOINT = "test_endpoint"
+EVENT_FIELD_MAP = json.dumps({"id": "name", "start": "starts_on", "end": "ends_on", "allDay": "all_day"})
+
+
+def get_server_id():
+    return frappe.db.sql("SELECT @@server_id")[0][0]
+
+
+def get_server_rows():
+    return [frappe._dict(server_id=get_server_id(), modified=now_datetime())]
+
+
+# needs a second MariaDB replicating from the site's database, with a different server_id,
+# set as `replica_host` (and `replica_db_port`) in the test site's config
+@unittest.skipUnless(frappe.conf.replica_host, "no read replica configured for the test site")
+class TestReadFromReplica(FrappeTestCase):
+    def setUp(self):
+        frappe.cache.delete_value(LAG_CACHE_KEY)
+        self.primary = get_server_id()
+
+    def tearDown(self):
+        close_replica()
+        frappe.cache.delete_value(LAG_CACHE_KEY)
+        frappe.cache.delete_keys(f"calendar_replica::{ENDPOINT}")
+
+    def call(self, fn, settings, **conf):
+        with patch.dict(frappe.conf, {"read_from_replica": 1, REPLICA_SETTING: {ENDPOINT: settings}, **conf}):
+            return read_from_replica(ENDPOINT)(fn)()
+
+    def test_fresh_replica_serves_reads(self):
+        self.assertNotEqual(self.call(get_server_id, {"max_staleness": 30}), self.primary)
+        self.assertEqual(get_server_id(), self.primary)
+
+    def test_replica_connection_is_kept_for_the_request(self):
+        self.call(get_server_id, {"max_staleness": 30})
+        replica = frappe.local.replica_db
+
+        self.assertNotEqual(self.call(get_server_id, {"max_staleness": 30}), self.primary)
+        self.assertIs(frappe.local.replica_db, replica)
+
+        close_replica()
+        self.assertFalse(hasattr(frappe.local, "replica_db"))
+        self.assertEqual(get_server_id(), self.primary)
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        self.assertEqual(self.call(get_server_id, {"max_staleness": -1}), self.primary)
+
+    def test_lagging_replica_falls_back_to_cache(self):
+        fresh = self.call(get_server_rows, {"max_staleness": 30, "fallback": "cache"})
+        cached = self.call(get_server_rows, {"max_staleness": -1, "fallback": "cache"})
+
+        self.assertNotEqual(cached[0].server_id, self.primary)
+        self.assertEqual(cached[0].server_id, fresh[0].server_id)
+        self.assertNotIn("modified", cached[0])
+
+    def test_unreachable_replica_falls_back_to_primary(self):
+        self.assertEqual(self.call(get_server_id, {"max_staleness": 30}, replica_db_port=1), self.primary)
+        self.assertEqual(frappe.cache.get_value(LAG_CACHE_KEY), REPLICA_DOWN)
+
+    def test_replica_failing_during_call_reruns_on_primary(self):
+        # a lag measured before the replica went away
+        frappe.cache.set_value(LAG_CACHE_KEY, 0)
+
+        self.assertEqual(self.call(get_server_id, {"max_staleness": 30}, replica_db_port=1), self.primary)
+        self.assertEqual(frappe.cache.get_value(LAG_CACHE_KEY), REPLICA_DOWN)
+        self.assertFalse(hasattr(frappe.local, "replica_db"))
+
+    def test_move_after_fetch_from_lagging_replica(self):
+        # the replica only sees committed rows
+        event = frappe.get_doc(
+            {
+                "doctype": "Event",
+                "subject": "Moved before a replica read",
+                "event_type": "Public",
+                "starts_on": "2026-02-02 10:00:00",
+                "ends_on": "2026-02-02 11:00:00",
+            }
+        ).insert()
+        frappe.db.commit()
+        self.addCleanup(self.delete_committed_event, event.name)
+
+        self.move(event.name, "2026-02-03", event.modified)
+        frappe.db.commit()
+
+        # a lag within max_staleness: the replica is read although it may predate the move
+        settings = {
+            "read_from_replica": 1,
+            REPLICA_SETTING: {"custom_get_events": {"max_staleness": 30}},
+            "calendar_event_cache": {"enabled": 0},
+        }
+        fetched = None
+        for _ in range(50):
+            frappe.cache.set_value(LAG_CACHE_KEY, 20)
+            with patch.dict(frappe.conf, settings):
+                events = custom_get_events("2026-02-01", "2026-02-28")
+            if fetched := next((e for e in events if e.name == event.name), None):
+                break
+            time.sleep(0.1)
+
+        self.assertIsNotNone(fetched, "the Event did not reach the replica")
+        self.assertNotIn("modified", fetched)
+
+        # moving what was fetched is not mistaken for a conflict
+        self.move(event.name, "2026-02-04", fetched.get("modified"))
+
+    def move(self, event, day, modified):
+        move = {
+            "doctype": "Event",
+            "name": event,
+            "starts_on": f"{day} 10:00:00",
+            "ends_on": f"{day} 11:00:00",
+        }
+        if modified:
+            move["modified"] = str(modified)
+
+        return custom_update_event(json.dumps(move), EVENT_FIELD_MAP)
+
+    def delete_committed_event(self, event):
+        frappe.delete_doc("Event", event, force=True)
+        frappe.db.commit()